@@ -1,15 +1,25 @@
 import os
+import time
 import logging
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify
+from typing import Annotated
+from flask import Flask, Response, request
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text
+from sqlalchemy import DDL, Interval, event, func, insert, lambda_stmt, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+from sqlalchemy.exc import IntegrityError
+from psycopg2 import errorcodes
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
-from marshmallow import Schema, fields, ValidationError
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+import ciso8601
+import msgspec
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import redis
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,6 +42,17 @@ db_name = os.getenv('POSTGRES_DB', 'appointment_db')
 
 app.config['SQLALCHEMY_DATABASE_URI'] = f'postgresql://{db_username}:{db_password}@{db_host}:{db_port}/{db_name}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Pool limits are per gunicorn worker: keep (pool_size + max_overflow) * workers * replicas below max_connections
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': int(os.getenv('POSTGRES_POOL_SIZE', 5)),
+    'max_overflow': int(os.getenv('POSTGRES_MAX_OVERFLOW', 5)),
+    'pool_recycle': int(os.getenv('POSTGRES_POOL_RECYCLE', 3600)),
+    'pool_timeout': int(os.getenv('POSTGRES_POOL_TIMEOUT', 10)),
+    'pool_pre_ping': os.getenv('POSTGRES_POOL_PRE_PING', 'True').lower() == 'true',
+    'future': True,
+    'query_cache_size': int(os.getenv('SQLALCHEMY_QUERY_CACHE_SIZE', 1200)),
+    'executemany_mode': 'values_plus_batch'
+}
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
 
 db = SQLAlchemy(app)
@@ -39,6 +60,26 @@ migrate = Migrate(app, db)
 jwt = JWTManager(app)
 CORS(app)
 
+# Redis cache (optional - caching is disabled when REDIS_URL is not set)
+REDIS_URL = os.getenv('REDIS_URL')
+cache = None
+if REDIS_URL:
+    redis_pool = redis.ConnectionPool.from_url(REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+    cache = redis.Redis(connection_pool=redis_pool)
+
+# Pooled keep-alive session for calls to the patient service
+PATIENT_SERVICE_URL = os.getenv('PATIENT_SERVICE_URL', 'http://patient-service:3001')
+patient_session = requests.Session()
+patient_session.mount('http://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.1, allowed_methods=frozenset(['GET', 'POST']))
+))
+
+AVAILABILITY_CACHE_TTL = int(os.getenv('AVAILABILITY_CACHE_TTL', 90))
+PATIENT_CACHE_TTL = int(os.getenv('PATIENT_CACHE_TTL', 300))
+APPOINTMENT_CACHE_TTL = int(os.getenv('APPOINTMENT_CACHE_TTL', 60))
+
 # Prometheus metrics
 REQUEST_COUNT = Counter('appointment_requests_total', 'Total appointment requests', ['method', 'endpoint'])
 REQUEST_DURATION = Histogram('appointment_request_duration_seconds', 'Appointment request duration')
@@ -46,11 +87,20 @@ REQUEST_DURATION = Histogram('appointment_request_duration_seconds', 'Appointmen
 # Models
 class Appointment(db.Model):
     __tablename__ = 'appointments'
+    __table_args__ = (
+        # Covers availability and conflict lookups without touching the heap (INCLUDE needs PG 11+)
+        db.Index(
+            'ix_appt_doc_date_status', 'doctor_id', 'appointment_date', 'status',
+            postgresql_using='btree',
+            postgresql_include=['duration_minutes']
+        ),
+        db.Index('ix_appt_patient_date', 'patient_id', 'appointment_date', postgresql_using='btree'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    patient_id = db.Column(db.String(50), nullable=False, index=True)
+    patient_id = db.Column(db.String(50), nullable=False)
     doctor_id = db.Column(db.String(50), nullable=False)
-    appointment_date = db.Column(db.DateTime, nullable=False, index=True)
+    appointment_date = db.Column(db.DateTime, nullable=False)
     duration_minutes = db.Column(db.Integer, default=30)
     appointment_type = db.Column(db.String(50), nullable=False)
     status = db.Column(db.String(20), default='scheduled')  # scheduled, confirmed, completed, cancelled
@@ -63,33 +113,123 @@ class Appointment(db.Model):
             'id': self.id,
             'patient_id': self.patient_id,
             'doctor_id': self.doctor_id,
-            'appointment_date': self.appointment_date.isoformat(),
+            'appointment_date': self.appointment_date,
             'duration_minutes': self.duration_minutes,
             'appointment_type': self.appointment_type,
             'status': self.status,
             'notes': self.notes,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
-# Schemas
-class AppointmentSchema(Schema):
-    id = fields.Integer(dump_only=True)
-    patient_id = fields.String(required=True)
-    doctor_id = fields.String(required=True)
-    appointment_date = fields.DateTime(required=True)
-    duration_minutes = fields.Integer(missing=30)
-    appointment_type = fields.String(required=True)
-    status = fields.String(missing='scheduled')
-    notes = fields.String(allow_none=True)
+# End of an appointment evaluated in Postgres (appointment_date + duration_minutes)
+APPOINTMENT_END = Appointment.appointment_date + (
+    literal_column("interval '1 minute'", Interval) * Appointment.duration_minutes
+)
+
+# A doctor cannot have two active appointments whose time ranges overlap (enforced atomically by Postgres)
+Appointment.__table__.append_constraint(ExcludeConstraint(
+    (Appointment.__table__.c.doctor_id, '='),
+    (func.tsrange(Appointment.appointment_date, APPOINTMENT_END), '&&'),
+    name='excl_appt_doctor_overlap',
+    using='gist',
+    where=Appointment.status.in_(['scheduled', 'confirmed'])
+))
+event.listen(Appointment.__table__, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS btree_gist'))
+
+def is_scheduling_conflict(error):
+    return getattr(error.orig, 'pgcode', None) == errorcodes.EXCLUSION_VIOLATION
+
+# Availability grid: 30-minute slots from 9:00 to 17:00, as bit positions counted from midnight
+SLOT_MINUTES = 30
+SLOT_SECONDS = SLOT_MINUTES * 60
+FIRST_SLOT = 9 * 60 // SLOT_MINUTES
+END_SLOT = 17 * 60 // SLOT_MINUTES
+WORK_MASK = ((1 << END_SLOT) - 1) ^ ((1 << FIRST_SLOT) - 1)
+
+def _free_slots(start_of_day, appointments):
+    # OR each appointment's covered slots into one integer, then emit the remaining working-hour bits
+    busy = 0
+    for appointment_date, duration_minutes in appointments:
+        start = int((appointment_date - start_of_day).total_seconds())
+        end = start + (duration_minutes or 0) * 60
+        first = start // SLOT_SECONDS
+        # Bits past the working day are masked out anyway; clamping keeps the shift small
+        last = min(-(-end // SLOT_SECONDS), END_SLOT)
+        if last > first:
+            busy |= ((1 << last) - 1) ^ ((1 << first) - 1)
+    
+    free = WORK_MASK & ~busy
+    slots = []
+    while free:
+        lowest = free & -free
+        slot = lowest.bit_length() - 1
+        slots.append((start_of_day + timedelta(minutes=slot * SLOT_MINUTES)).isoformat())
+        free ^= lowest
+    return slots
+
+# Column-only projection used by list endpoints (skips ORM hydration)
+COLUMNS = (
+    Appointment.id,
+    Appointment.patient_id,
+    Appointment.doctor_id,
+    Appointment.appointment_date,
+    Appointment.duration_minutes,
+    Appointment.appointment_type,
+    Appointment.status,
+    Appointment.notes,
+    Appointment.created_at,
+    Appointment.updated_at
+)
+FIELDS = tuple(column.key for column in COLUMNS)
 
-appointment_schema = AppointmentSchema()
-appointments_schema = AppointmentSchema(many=True)
+# Core table columns for the list endpoint, which runs outside the ORM and Session
+appointments_table = Appointment.__table__
+TABLE_COLUMNS = tuple(appointments_table.c[field] for field in FIELDS)
+
+def _row_to_json(row):
+    return dict(zip(FIELDS, row))
+
+# Request bodies (decoded straight from JSON bytes; unknown fields are ignored)
+# Durations must be positive (an empty range breaks the overlap constraint's tsrange) and at most one day
+DurationMinutes = Annotated[int, msgspec.Meta(gt=0, le=24 * 60)]
+
+class AppointmentIn(msgspec.Struct):
+    patient_id: str
+    doctor_id: str
+    appointment_date: datetime
+    appointment_type: str
+    duration_minutes: DurationMinutes = 30
+    status: str = 'scheduled'
+    notes: str | None = None
+
+class AppointmentUpdate(msgspec.Struct):
+    patient_id: str | msgspec.UnsetType = msgspec.UNSET
+    doctor_id: str | msgspec.UnsetType = msgspec.UNSET
+    appointment_date: datetime | msgspec.UnsetType = msgspec.UNSET
+    appointment_type: str | msgspec.UnsetType = msgspec.UNSET
+    duration_minutes: DurationMinutes | msgspec.UnsetType = msgspec.UNSET
+    status: str | msgspec.UnsetType = msgspec.UNSET
+    notes: str | None | msgspec.UnsetType = msgspec.UNSET
+
+appointment_decoder = msgspec.json.Decoder(AppointmentIn)
+appointments_decoder = msgspec.json.Decoder(list[AppointmentIn])
+appointment_update_decoder = msgspec.json.Decoder(AppointmentUpdate)
+
+# JSON responses are serialized with orjson (datetimes are handled natively)
+def dump_json(data):
+    return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC)
+
+def json_response(data):
+    return Response(dump_json(data), mimetype='application/json')
 
 # Middleware for metrics
 @app.before_request
 def before_request():
-    REQUEST_COUNT.labels(method=request.method, endpoint=request.endpoint).inc()
+    counter = REQUEST_COUNTERS.get((request.method, request.endpoint))
+    if counter is None:
+        counter = REQUEST_COUNT.labels(method=request.method, endpoint=request.endpoint)
+    counter.inc()
 
 @app.after_request
 def after_request(response):
@@ -98,7 +238,7 @@ def after_request(response):
 # Root endpoint
 @app.route('/')
 def root():
-    return jsonify({
+    return json_response({
         'service': 'Appointment Service',
         'version': '1.0.0',
         'description': 'Healthcare appointment management microservice',
@@ -109,56 +249,191 @@ def root():
             'appointments': {
                 'list': 'GET /api/appointments',
                 'create': 'POST /api/appointments',
+                'bulk_create': 'POST /api/appointments/bulk',
                 'get': 'GET /api/appointments/{id}',
                 'update': 'PUT /api/appointments/{id}',
                 'delete': 'DELETE /api/appointments/{id}'
             },
             'availability': 'GET /api/availability/{doctor_id}'
         },
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': datetime.utcnow()
     })
 
 # Health check endpoints
+# Probe responses: /health is static and /ready re-checks the database at most every READY_CACHE_SECONDS
+HEALTH_BODY = dump_json({
+    'status': 'healthy',
+    'service': 'appointment-service',
+    'timestamp': datetime.utcnow(),
+    'version': '1.0.0'
+})
+READY_CACHE_SECONDS = float(os.getenv('READY_CACHE_SECONDS', 2))
+_ready_cache = {'checked_at': None, 'error': None}
+
 @app.route('/health')
 def health():
-    return jsonify({
-        'status': 'healthy',
-        'service': 'appointment-service',
-        'timestamp': datetime.utcnow().isoformat(),
-        'version': '1.0.0'
-    })
+    return Response(HEALTH_BODY, mimetype='application/json')
 
 @app.route('/ready')
 def ready():
-    try:
-        # Test database connection
-        db.session.execute(text('SELECT 1'))
-        return jsonify({
+    now = time.monotonic()
+    if _ready_cache['checked_at'] is None or now - _ready_cache['checked_at'] >= READY_CACHE_SECONDS:
+        try:
+            # Test database connection
+            with db.engine.connect() as connection:
+                connection.execution_options(isolation_level='AUTOCOMMIT').execute(text('SELECT 1'))
+            _ready_cache['error'] = None
+        except Exception as e:
+            logger.error(f"Readiness check failed: {e}")
+            _ready_cache['error'] = str(e)
+        _ready_cache['checked_at'] = now
+    
+    if _ready_cache['error'] is None:
+        return json_response({
             'status': 'ready',
             'database': 'connected'
         })
-    except Exception as e:
-        logger.error(f"Readiness check failed: {e}")
-        return jsonify({
-            'status': 'not ready',
-            'database': 'disconnected',
-            'error': str(e)
-        }), 503
+    return json_response({
+        'status': 'not ready',
+        'database': 'disconnected',
+        'error': _ready_cache['error']
+    }), 503
 
 # Metrics endpoint
 @app.route('/metrics')
 def metrics():
+    # Under gunicorn each worker writes its samples to PROMETHEUS_MULTIPROC_DIR; aggregate them here
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), 200, {'Content-Type': CONTENT_TYPE_LATEST}
     return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
 
+# Cache helpers
+def cache_get(key):
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+def cache_get_many(keys):
+    if cache is None:
+        return [None] * len(keys)
+    try:
+        return cache.mget(keys)
+    except redis.RedisError as e:
+        logger.warning(f"Cache mget failed: {e}")
+        return [None] * len(keys)
+
+def cache_set(key, ttl, value):
+    if cache is None:
+        return
+    try:
+        cache.setex(key, ttl, value)
+    except redis.RedisError as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+def cache_set_many(keys, ttl, value):
+    if cache is None or not keys:
+        return
+    try:
+        pipe = cache.pipeline(transaction=False)
+        for key in keys:
+            pipe.setex(key, ttl, value)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Cache set failed for {len(keys)} keys: {e}")
+
+def cache_delete(*keys):
+    if cache is None:
+        return
+    try:
+        cache.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Cache delete failed for {keys}: {e}")
+
+def appointment_key(appointment_id):
+    return f"appt:{appointment_id}"
+
+def availability_key(doctor_id, day):
+    return f"avail:{doctor_id}:{day.isoformat()}"
+
+def invalidate_availability(*appointments):
+    # Each entry is a (doctor_id, appointment_date) pair
+    keys = {availability_key(doctor_id, start.date()) for doctor_id, start in appointments if start}
+    if keys:
+        cache_delete(*keys)
+
+def patient_key(patient_id):
+    return f"patient:{patient_id}"
+
 # Helper function to validate patient exists
 def validate_patient(patient_id):
+    key = patient_key(patient_id)
+    if cache_get(key):
+        return True
     try:
-        patient_service_url = os.getenv('PATIENT_SERVICE_URL', 'http://patient-service:3001')
-        response = requests.get(f"{patient_service_url}/api/patients/{patient_id}", timeout=5)
-        return response.status_code == 200
+        response = patient_session.get(f"{PATIENT_SERVICE_URL}/api/patients/{patient_id}", timeout=5)
+        exists = response.status_code == 200
     except requests.RequestException as e:
         logger.error(f"Failed to validate patient {patient_id}: {e}")
         return False
+    # Only positive results are cached so newly created patients are seen immediately
+    if exists:
+        cache_set(key, PATIENT_CACHE_TTL, 1)
+    return exists
+
+# Helper function to validate many patients with a single request
+def validate_patients(patient_ids):
+    patient_ids = list(dict.fromkeys(patient_ids))
+    cached = cache_get_many([patient_key(patient_id) for patient_id in patient_ids])
+    valid = {patient_id for patient_id, hit in zip(patient_ids, cached) if hit}
+    missing = [patient_id for patient_id in patient_ids if patient_id not in valid]
+    if not missing:
+        return valid
+    try:
+        response = patient_session.post(
+            f"{PATIENT_SERVICE_URL}/api/patients/exists",
+            json={'ids': missing},
+            timeout=5
+        )
+        response.raise_for_status()
+        found = set(response.json()['ids'])
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logger.error(f"Failed to validate {len(missing)} patients: {e}")
+        return valid
+    cache_set_many([patient_key(patient_id) for patient_id in found], PATIENT_CACHE_TTL, 1)
+    return valid | found
+
+# Query-string parsing errors are reported to the client as 400s
+class InvalidArgument(ValueError):
+    pass
+
+def parse_datetime_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return ciso8601.parse_datetime(value)
+    except ValueError:
+        raise InvalidArgument(f"Invalid {name}: expected an ISO 8601 date")
+
+# Appends the list filters to a lambda statement so the compiled SQL is cached per filter combination
+def _filter_appointments(stmt, patient_id, doctor_id, status, date_from, date_to):
+    if patient_id:
+        stmt += lambda s: s.where(appointments_table.c.patient_id == patient_id)
+    if doctor_id:
+        stmt += lambda s: s.where(appointments_table.c.doctor_id == doctor_id)
+    if status:
+        stmt += lambda s: s.where(appointments_table.c.status == status)
+    if date_from:
+        stmt += lambda s: s.where(appointments_table.c.appointment_date >= date_from)
+    if date_to:
+        stmt += lambda s: s.where(appointments_table.c.appointment_date <= date_to)
+    return stmt
 
 # Appointment routes
 @app.route('/api/appointments', methods=['GET'])
@@ -169,133 +444,225 @@ def get_appointments():
         patient_id = request.args.get('patient_id')
         doctor_id = request.args.get('doctor_id')
         status = request.args.get('status')
-        date_from = request.args.get('date_from')
-        date_to = request.args.get('date_to')
-        
-        query = Appointment.query
-        
-        if patient_id:
-            query = query.filter_by(patient_id=patient_id)
-        if doctor_id:
-            query = query.filter_by(doctor_id=doctor_id)
-        if status:
-            query = query.filter_by(status=status)
-        if date_from:
-            query = query.filter(Appointment.appointment_date >= datetime.fromisoformat(date_from))
-        if date_to:
-            query = query.filter(Appointment.appointment_date <= datetime.fromisoformat(date_to))
-        
-        appointments = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        date_from = parse_datetime_arg('date_from')
+        date_to = parse_datetime_arg('date_to')
+        
+        page = max(page, 1)
+        if per_page < 1:
+            per_page = 10
+        offset = (page - 1) * per_page
+        filters = (
+            patient_id,
+            doctor_id,
+            status,
+            date_from,
+            date_to
         )
         
-        return jsonify({
-            'appointments': [apt.to_dict() for apt in appointments.items],
-            'total': appointments.total,
-            'pages': appointments.pages,
+        count_stmt = _filter_appointments(lambda_stmt(lambda: select(func.count(appointments_table.c.id))), *filters)
+        stmt = _filter_appointments(lambda_stmt(lambda: select(*TABLE_COLUMNS)), *filters)
+        stmt += lambda s: s.limit(per_page).offset(offset)
+        
+        # Plain Core connection: no ORM compilation or Session bookkeeping on the read path
+        with db.engine.connect() as connection:
+            total = connection.execute(count_stmt).scalar()
+            rows = connection.execute(stmt).all()
+        
+        pages = (total + per_page - 1) // per_page
+        return json_response({
+            'appointments': [_row_to_json(row) for row in rows],
+            'total': total,
+            'pages': pages,
             'current_page': page,
-            'has_next': appointments.has_next,
-            'has_prev': appointments.has_prev
+            'has_next': page < pages,
+            'has_prev': page > 1
         })
         
+    except InvalidArgument as e:
+        return json_response({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error getting appointments: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/api/appointments/<int:appointment_id>', methods=['GET'])
 def get_appointment(appointment_id):
     try:
-        appointment = Appointment.query.get_or_404(appointment_id)
-        return jsonify(appointment.to_dict())
+        # Serve the cached JSON body when present; it is dropped on update/cancel
+        key = appointment_key(appointment_id)
+        cached = cache_get(key)
+        if cached is not None:
+            return Response(cached, mimetype='application/json')
+        
+        row = db.session.execute(lambda_stmt(
+            lambda: select(*COLUMNS).where(Appointment.id == appointment_id)
+        )).first()
+        if row is None:
+            return json_response({'error': 'Appointment not found'}), 404
+        
+        body = dump_json(_row_to_json(row))
+        cache_set(key, APPOINTMENT_CACHE_TTL, body)
+        return Response(body, mimetype='application/json')
     except Exception as e:
         logger.error(f"Error getting appointment {appointment_id}: {e}")
-        return jsonify({'error': 'Appointment not found'}), 404
+        return json_response({'error': 'Appointment not found'}), 404
 
 @app.route('/api/appointments', methods=['POST'])
 def create_appointment():
     try:
-        data = request.get_json()
-        
         # Validate input
         try:
-            result = appointment_schema.load(data)
-        except ValidationError as err:
-            return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
+            result = msgspec.structs.asdict(appointment_decoder.decode(request.get_data()))
+        except msgspec.DecodeError as err:
+            return json_response({'error': 'Validation error', 'messages': str(err)}), 400
         
         # Validate patient exists
         if not validate_patient(result['patient_id']):
-            return jsonify({'error': 'Patient not found'}), 400
-        
-        # Check for scheduling conflicts
-        appointment_start = result['appointment_date']
-        appointment_end = appointment_start + timedelta(minutes=result.get('duration_minutes', 30))
-        
-        conflict = Appointment.query.filter(
-            Appointment.doctor_id == result['doctor_id'],
-            Appointment.appointment_date < appointment_end,
-            Appointment.appointment_date + timedelta(minutes=Appointment.duration_minutes) > appointment_start,
-            Appointment.status.in_(['scheduled', 'confirmed'])
-        ).first()
-        
-        if conflict:
-            return jsonify({'error': 'Scheduling conflict detected'}), 409
+            return json_response({'error': 'Patient not found'}), 400
         
+        # Scheduling conflicts are rejected by the excl_appt_doctor_overlap constraint
         appointment = Appointment(**result)
         db.session.add(appointment)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            if not is_scheduling_conflict(e):
+                raise
+            db.session.rollback()
+            return json_response({'error': 'Scheduling conflict detected'}), 409
+        invalidate_availability((appointment.doctor_id, appointment.appointment_date))
         
         logger.info(f"Appointment created: {appointment.id}")
-        return jsonify(appointment.to_dict()), 201
+        return json_response(appointment.to_dict()), 201
         
     except Exception as e:
         logger.error(f"Error creating appointment: {e}")
         db.session.rollback()
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
+
+@app.route('/api/appointments/bulk', methods=['POST'])
+def create_appointments_bulk():
+    try:
+        # Validate input
+        try:
+            results = [msgspec.structs.asdict(item) for item in appointments_decoder.decode(request.get_data())]
+        except msgspec.DecodeError as err:
+            return json_response({'error': 'Validation error', 'messages': str(err)}), 400
+        
+        if not results:
+            return json_response({'error': 'No appointments provided'}), 400
+        
+        # Validate all patients exist with a single patient-service call
+        patient_ids = {result['patient_id'] for result in results}
+        missing = patient_ids - validate_patients(patient_ids)
+        if missing:
+            return json_response({'error': 'Patient not found', 'patient_ids': sorted(missing)}), 400
+        
+        # One multi-row INSERT in a single transaction; a conflict rejects the whole batch
+        try:
+            rows = db.session.execute(
+                insert(Appointment).returning(*COLUMNS, sort_by_parameter_order=True),
+                results
+            ).all()
+            db.session.commit()
+        except IntegrityError as e:
+            if not is_scheduling_conflict(e):
+                raise
+            db.session.rollback()
+            return json_response({'error': 'Scheduling conflict detected'}), 409
+        
+        invalidate_availability(*((row.doctor_id, row.appointment_date) for row in rows))
+        
+        logger.info(f"Appointments created in bulk: {len(rows)}")
+        return json_response({'appointments': [_row_to_json(row) for row in rows]}), 201
+        
+    except Exception as e:
+        logger.error(f"Error creating appointments in bulk: {e}")
+        db.session.rollback()
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/api/appointments/<int:appointment_id>', methods=['PUT'])
 def update_appointment(appointment_id):
     try:
-        appointment = Appointment.query.get_or_404(appointment_id)
-        data = request.get_json()
+        # Validate input (only the fields present in the body are updated)
+        try:
+            changes = appointment_update_decoder.decode(request.get_data())
+        except msgspec.DecodeError as err:
+            return json_response({'error': 'Validation error', 'messages': str(err)}), 400
+        result = {
+            key: value for key, value in msgspec.structs.asdict(changes).items()
+            if value is not msgspec.UNSET
+        }
+        
+        # Update in one statement; the CTE snapshots the old doctor/date for cache invalidation
+        previous = select(
+            Appointment.id,
+            Appointment.doctor_id,
+            Appointment.appointment_date
+        ).where(Appointment.id == appointment_id).with_for_update().cte('previous')
         
-        # Validate input
         try:
-            result = appointment_schema.load(data, partial=True)
-        except ValidationError as err:
-            return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
+            row = db.session.execute(
+                update(Appointment)
+                .where(Appointment.id == previous.c.id)
+                .values(**result, updated_at=datetime.utcnow())
+                .returning(
+                    *COLUMNS,
+                    previous.c.doctor_id.label('previous_doctor_id'),
+                    previous.c.appointment_date.label('previous_appointment_date')
+                )
+                .execution_options(synchronize_session=False)
+            ).first()
+        except IntegrityError as e:
+            if not is_scheduling_conflict(e):
+                raise
+            db.session.rollback()
+            return json_response({'error': 'Scheduling conflict detected'}), 409
         
-        # Update appointment
-        for key, value in result.items():
-            setattr(appointment, key, value)
+        if row is None:
+            db.session.rollback()
+            return json_response({'error': 'Appointment not found'}), 404
         
-        appointment.updated_at = datetime.utcnow()
         db.session.commit()
+        cache_delete(appointment_key(appointment_id))
+        invalidate_availability(
+            (row.previous_doctor_id, row.previous_appointment_date),
+            (row.doctor_id, row.appointment_date)
+        )
         
-        logger.info(f"Appointment updated: {appointment.id}")
-        return jsonify(appointment.to_dict())
+        logger.info(f"Appointment updated: {row.id}")
+        return json_response(_row_to_json(row))
         
     except Exception as e:
         logger.error(f"Error updating appointment {appointment_id}: {e}")
         db.session.rollback()
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/api/appointments/<int:appointment_id>', methods=['DELETE'])
 def cancel_appointment(appointment_id):
     try:
-        appointment = Appointment.query.get_or_404(appointment_id)
-        appointment.status = 'cancelled'
-        appointment.updated_at = datetime.utcnow()
+        row = db.session.execute(
+            update(Appointment)
+            .where(Appointment.id == appointment_id)
+            .values(status='cancelled', updated_at=datetime.utcnow())
+            .returning(Appointment.doctor_id, Appointment.appointment_date)
+            .execution_options(synchronize_session=False)
+        ).first()
+        
+        if row is None:
+            db.session.rollback()
+            return json_response({'error': 'Appointment not found'}), 404
+        
         db.session.commit()
+        cache_delete(appointment_key(appointment_id))
+        invalidate_availability((row.doctor_id, row.appointment_date))
         
-        logger.info(f"Appointment cancelled: {appointment.id}")
+        logger.info(f"Appointment cancelled: {appointment_id}")
         return '', 204
         
     except Exception as e:
         logger.error(f"Error cancelling appointment {appointment_id}: {e}")
         db.session.rollback()
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 # Availability check endpoint
 @app.route('/api/availability/<doctor_id>', methods=['GET'])
@@ -303,58 +670,64 @@ def check_availability(doctor_id):
     try:
         date_str = request.args.get('date')
         if not date_str:
-            return jsonify({'error': 'Date parameter required'}), 400
+            return json_response({'error': 'Date parameter required'}), 400
+        
+        date = parse_datetime_arg('date').date()
+        key = availability_key(doctor_id, date)
+        
+        cached = cache_get(key)
+        if cached is not None:
+            return json_response({
+                'doctor_id': doctor_id,
+                'date': date_str,
+                'available_slots': orjson.loads(cached)
+            })
         
-        date = datetime.fromisoformat(date_str).date()
         start_of_day = datetime.combine(date, datetime.min.time())
-        end_of_day = datetime.combine(date, datetime.max.time())
+        day_end = start_of_day.replace(hour=17)
         
-        appointments = Appointment.query.filter(
+        # Only start/duration are needed, both covered by ix_appt_doc_date_status
+        appointments = db.session.execute(lambda_stmt(lambda: select(
+            Appointment.appointment_date,
+            Appointment.duration_minutes
+        ).where(
             Appointment.doctor_id == doctor_id,
             Appointment.appointment_date >= start_of_day,
-            Appointment.appointment_date <= end_of_day,
+            Appointment.appointment_date < day_end,
             Appointment.status.in_(['scheduled', 'confirmed'])
-        ).all()
-        
-        # Generate available slots (9 AM to 5 PM, 30-minute slots)
-        available_slots = []
-        current_time = start_of_day.replace(hour=9)
-        end_time = start_of_day.replace(hour=17)
-        
-        while current_time < end_time:
-            slot_end = current_time + timedelta(minutes=30)
-            
-            # Check if slot conflicts with existing appointments
-            conflict = any(
-                apt.appointment_date < slot_end and
-                apt.appointment_date + timedelta(minutes=apt.duration_minutes) > current_time
-                for apt in appointments
-            )
-            
-            if not conflict:
-                available_slots.append(current_time.isoformat())
-            
-            current_time = slot_end
-        
-        return jsonify({
+        ))).all()
+        available_slots = _free_slots(start_of_day, appointments)
+        
+        cache_set(key, AVAILABILITY_CACHE_TTL, orjson.dumps(available_slots))
+        
+        return json_response({
             'doctor_id': doctor_id,
             'date': date_str,
             'available_slots': available_slots
         })
         
+    except InvalidArgument as e:
+        return json_response({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error checking availability for doctor {doctor_id}: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({'error': 'Resource not found'}), 404
+    return json_response({'error': 'Resource not found'}), 404
 
 @app.errorhandler(500)
 def internal_error(error):
     db.session.rollback()
-    return jsonify({'error': 'Internal server error'}), 500
+    return json_response({'error': 'Internal server error'}), 500
+
+# Pre-bound request counters for every route, so before_request skips the labels() lookup
+REQUEST_COUNTERS = {
+    (method, rule.endpoint): REQUEST_COUNT.labels(method=method, endpoint=rule.endpoint)
+    for rule in app.url_map.iter_rules()
+    for method in rule.methods - {'HEAD', 'OPTIONS'}
+}
 
 if __name__ == '__main__':
     with app.app_context():
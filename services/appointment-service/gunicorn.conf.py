@@ -0,0 +1,28 @@
+import os
+import shutil
+
+# Multiprocess metrics are enabled for gunicorn only, so other entry points (flask db upgrade,
+# python app.py) never need the directory. prometheus_client reads this at import time.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus')
+
+from prometheus_client import multiprocess  # noqa: E402
+
+
+def on_starting(server):
+    # Start every run with an empty metrics directory so stale worker files are not aggregated
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # gevent workers patch sockets, but psycopg2 is a C extension and needs its own wait callback
+    if server.cfg.worker_class_str == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,39 @@
+"""add doctor overlap exclusion constraint
+
+Revision ID: 3f2a9c1d7b40
+Revises: 
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    # Tables created by db.create_all() already carry the constraint; only add it where it is missing.
+    # Fails if the table already holds overlapping active appointments - resolve those first.
+    op.execute("""
+        DO $$
+        BEGIN
+            IF to_regclass('appointments') IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'excl_appt_doctor_overlap'
+            ) THEN
+                ALTER TABLE appointments ADD CONSTRAINT excl_appt_doctor_overlap EXCLUDE USING gist (
+                    doctor_id WITH =,
+                    tsrange(appointment_date, appointment_date + interval '1 minute' * duration_minutes) WITH &&
+                ) WHERE (status IN ('scheduled', 'confirmed'));
+            END IF;
+        END
+        $$;
+    """)
+
+
+def downgrade():
+    op.execute('ALTER TABLE appointments DROP CONSTRAINT IF EXISTS excl_appt_doctor_overlap')
@@ -0,0 +1,42 @@
+"""replace single-column appointment indexes with composite indexes
+
+Revision ID: 8b71e4c2a915
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b71e4c2a915'
+down_revision = '3f2a9c1d7b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables created by db.create_all() already have the composite indexes; only fix up older ones
+    if not sa.inspect(op.get_bind()).has_table('appointments'):
+        return
+    op.drop_index('ix_appointments_patient_id', table_name='appointments', if_exists=True)
+    op.drop_index('ix_appointments_appointment_date', table_name='appointments', if_exists=True)
+    op.create_index(
+        'ix_appt_doc_date_status', 'appointments', ['doctor_id', 'appointment_date', 'status'],
+        postgresql_using='btree',
+        postgresql_include=['duration_minutes'],
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_appt_patient_date', 'appointments', ['patient_id', 'appointment_date'],
+        postgresql_using='btree',
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_appt_patient_date', table_name='appointments', if_exists=True)
+    op.drop_index('ix_appt_doc_date_status', table_name='appointments', if_exists=True)
+    op.create_index('ix_appointments_appointment_date', 'appointments', ['appointment_date'], if_not_exists=True)
+    op.create_index('ix_appointments_patient_id', 'appointments', ['patient_id'], if_not_exists=True)
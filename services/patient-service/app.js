@@ -138,6 +138,7 @@ app.get('/', (req, res) => {
         list: 'GET /api/patients',
         create: 'POST /api/patients',
         get: 'GET /api/patients/{id}',
+        exists: 'POST /api/patients/exists',
         update: 'PUT /api/patients/{id}',
         delete: 'DELETE /api/patients/{id}'
       }
@@ -190,6 +191,21 @@ app.get('/api/patients/:id', async (req, res) => {
   }
 });
 
+app.post('/api/patients/exists', async (req, res) => {
+  try {
+    const { ids } = req.body;
+    if (!Array.isArray(ids)) {
+      return res.status(400).json({ error: 'ids must be an array' });
+    }
+    const validIds = ids.filter((id) => mongoose.Types.ObjectId.isValid(id));
+    const patients = await Patient.find({ _id: { $in: validIds } }).select('_id').lean();
+    res.json({ ids: patients.map((patient) => patient._id.toString()) });
+  } catch (error) {
+    logger.error('Error checking patients:', error);
+    res.status(500).json({ error: 'Internal server error' });
+  }
+});
+
 app.post('/api/patients', async (req, res) => {
   try {
     const patient = new Patient(req.body);